@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+import concurrent.futures
+import io
 import os
 import re
 import shutil
 import subprocess
 import threading
+import time
 import urllib.request
 import zipfile
 from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Iterable, Optional
+from typing import IO, Callable, Iterable, Iterator, Optional
 
 ProgressDict = dict
 
@@ -25,9 +28,18 @@ _IG_USER_AGENT = (
 )
 _PROGRESS_PREFIX = "__VD_PROGRESS__:"
 _FILE_PREFIX = "__VD_FILE__:"
-_PROGRESS_RE = re.compile(
-    r"^(?P<status>[^|]*)\|(?P<downloaded>[^|]*)\|(?P<total>[^|]*)\|(?P<estimate>[^|]*)\|(?P<speed>[^|]*)\|(?P<eta>.*)$"
-)
+_PROGRESS_PREFIX_B = _PROGRESS_PREFIX.encode("ascii")
+_FILE_PREFIX_B = _FILE_PREFIX.encode("ascii")
+# Only these yt-dlp lines are forwarded to the user log; the rest just go to
+# the recent_lines buffer used for error messages.
+_IMPORTANT_PREFIXES = (b"ERROR", b"WARNING", b"[download] Destination", b"[Merger]", b"[ffmpeg]")
+_READ_CHUNK = 64 * 1024
+_LINE_END_RE = re.compile(rb"\r\n|\r|\n")
+_DOWNLOAD_CHUNK = 4 * 1024 * 1024
+# Minimum interval between "downloading" progress callbacks, in seconds.
+_PROGRESS_INTERVAL = 0.1
+_FFMPEG_BIN_MEMBER_RE = re.compile(r"^[^/]+/bin/[^/]+$")
+_NA = frozenset(("", "NA", "None"))
 
 
 class DownloadError(RuntimeError):
@@ -46,8 +58,26 @@ class DownloadRequest:
 
 @dataclass(frozen=True)
 class _ToolPaths:
-    ytdlp_path: Path
-    ffmpeg_location: Optional[Path]
+    # Stored as strings since they go straight into every yt-dlp command line.
+    ytdlp_path: str
+    ffmpeg_location: Optional[str]
+
+
+_tools_lock = threading.Lock()
+_cached_tools: Optional[_ToolPaths] = None
+_made_dirs: set[str] = set()
+_made_dirs_lock = threading.Lock()
+
+
+def _ensure_dir(path: str | Path) -> None:
+    """``os.makedirs(path, exist_ok=True)``, skipped for directories already made this process."""
+    full = os.path.abspath(path)
+    key = os.path.normcase(full)
+    with _made_dirs_lock:
+        if key in _made_dirs:
+            return
+        os.makedirs(full, exist_ok=True)
+        _made_dirs.add(key)
 
 
 def _is_instagram_url(url: str) -> bool:
@@ -62,7 +92,7 @@ def _is_youtube_url(url: str) -> bool:
 
 def _to_int(value: str) -> Optional[int]:
     value = (value or "").strip()
-    if not value or value in {"NA", "None"}:
+    if value in _NA:
         return None
     try:
         return int(float(value))
@@ -72,7 +102,7 @@ def _to_int(value: str) -> Optional[int]:
 
 def _to_float(value: str) -> Optional[float]:
     value = (value or "").strip()
-    if not value or value in {"NA", "None"}:
+    if value in _NA:
         return None
     try:
         return float(value)
@@ -90,26 +120,29 @@ def _tools_root() -> Path:
     return root
 
 
+def _copy_with_progress(response: IO[bytes], out: IO[bytes], total: int, log: Callable[[str], None]) -> None:
+    downloaded = 0
+    step = total // 10
+    next_log_bytes = step
+    while True:
+        chunk = response.read(_DOWNLOAD_CHUNK)
+        if not chunk:
+            break
+        out.write(chunk)
+        downloaded += len(chunk)
+        if step and downloaded >= next_log_bytes:
+            log(f"Downloading tools... {downloaded * 100 // total}%")
+            next_log_bytes = (downloaded // step + 1) * step
+
+
 def _download_file(url: str, destination: Path, log: Callable[[str], None]) -> None:
     destination.parent.mkdir(parents=True, exist_ok=True)
     tmp = destination.with_suffix(destination.suffix + ".part")
     req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    downloaded = 0
-    next_percent_log = 10
     try:
         with urllib.request.urlopen(req, timeout=120) as response, tmp.open("wb") as out:
             total = int(response.headers.get("Content-Length") or 0)
-            while True:
-                chunk = response.read(1024 * 1024)
-                if not chunk:
-                    break
-                out.write(chunk)
-                downloaded += len(chunk)
-                if total > 0:
-                    pct = int(downloaded * 100 / total)
-                    if pct >= next_percent_log:
-                        log(f"Downloading tools... {pct}%")
-                        next_percent_log += 10
+            _copy_with_progress(response, out, total, log)
         tmp.replace(destination)
     except Exception:
         if tmp.exists():
@@ -117,6 +150,16 @@ def _download_file(url: str, destination: Path, log: Callable[[str], None]) -> N
         raise
 
 
+def _download_bytes(url: str, log: Callable[[str], None]) -> io.BytesIO:
+    req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+    buf = io.BytesIO()
+    with urllib.request.urlopen(req, timeout=120) as response:
+        total = int(response.headers.get("Content-Length") or 0)
+        _copy_with_progress(response, buf, total, log)
+    buf.seek(0)
+    return buf
+
+
 def _ensure_ytdlp(root: Path, log: Callable[[str], None]) -> Path:
     ytdlp_path = root / _YTDLP_EXE_NAME
     if ytdlp_path.exists():
@@ -127,11 +170,29 @@ def _ensure_ytdlp(root: Path, log: Callable[[str], None]) -> Path:
 
 
 def _find_ffmpeg_bin(search_root: Path) -> Optional[Path]:
-    for ffmpeg_exe in search_root.rglob("ffmpeg.exe"):
-        return ffmpeg_exe.parent
+    # Archive layout is always <top>/bin/ffmpeg.exe, so only look two levels deep.
+    with os.scandir(search_root) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            bin_dir = Path(entry.path, "bin")
+            if (bin_dir / "ffmpeg.exe").is_file():
+                return bin_dir
     return None
 
 
+def _ffmpeg_bin_members(zf: zipfile.ZipFile) -> list[zipfile.ZipInfo]:
+    """Return the archive entries under ``<top>/bin/``, rejecting unsafe paths."""
+    members: list[zipfile.ZipInfo] = []
+    for info in zf.infolist():
+        name = info.filename
+        if name.startswith("/") or ".." in name.split("/"):
+            raise DownloadError(f"Refusing unsafe path in FFmpeg archive: {name}")
+        if _FFMPEG_BIN_MEMBER_RE.match(name):
+            members.append(info)
+    return members
+
+
 def _ensure_ffmpeg(root: Path, log: Callable[[str], None]) -> Optional[Path]:
     ffmpeg_in_path = shutil.which("ffmpeg")
     if ffmpeg_in_path:
@@ -141,53 +202,71 @@ def _ensure_ffmpeg(root: Path, log: Callable[[str], None]) -> Optional[Path]:
     if (local_bin / "ffmpeg.exe").exists():
         return local_bin
 
-    archive_path = root / "ffmpeg-win64.zip"
     extract_dir = root / "ffmpeg-extract"
     log("FFmpeg not found. Downloading official FFmpeg build...")
-    _download_file(_FFMPEG_URL, archive_path, log)
+    # The archive is ~120 MB; keep it in memory rather than writing it to disk first.
+    archive = _download_bytes(_FFMPEG_URL, log)
 
     if extract_dir.exists():
         shutil.rmtree(extract_dir)
     extract_dir.mkdir(parents=True, exist_ok=True)
 
     try:
-        with zipfile.ZipFile(archive_path) as zf:
-            zf.extractall(extract_dir)
+        with zipfile.ZipFile(archive) as zf:
+            members = _ffmpeg_bin_members(zf)
+            for info in members:
+                zf.extract(info, extract_dir)
         bin_dir = _find_ffmpeg_bin(extract_dir)
         if not bin_dir:
             raise DownloadError("Downloaded FFmpeg archive did not contain ffmpeg.exe.")
 
         if local_bin.exists():
             shutil.rmtree(local_bin)
-        shutil.move(str(bin_dir), str(local_bin))
+        bin_dir.replace(local_bin)
     finally:
         if extract_dir.exists():
             shutil.rmtree(extract_dir, ignore_errors=True)
-        if archive_path.exists():
-            archive_path.unlink()
+        archive.close()
 
     if not (local_bin / "ffmpeg.exe").exists():
         raise DownloadError("FFmpeg installation failed: ffmpeg.exe not found after extraction.")
     return local_bin
 
 
+def _tools_present(tools: _ToolPaths) -> bool:
+    # Cheap re-check of cached tools, in case they were deleted or quarantined.
+    if not os.path.exists(tools.ytdlp_path):
+        return False
+    loc = tools.ffmpeg_location
+    return loc is None or os.path.exists(os.path.join(loc, "ffmpeg.exe")) or os.path.exists(os.path.join(loc, "ffmpeg"))
+
+
 def _ensure_tools(log: Callable[[str], None]) -> _ToolPaths:
-    root = _tools_root()
-    ytdlp_path = _ensure_ytdlp(root, log)
-    ffmpeg_location = _ensure_ffmpeg(root, log)
-    return _ToolPaths(ytdlp_path=ytdlp_path, ffmpeg_location=ffmpeg_location)
+    global _cached_tools
+    # The lock also keeps parallel downloads from fetching the same tool twice.
+    with _tools_lock:
+        if _cached_tools is None or not _tools_present(_cached_tools):
+            root = _tools_root()
+            ytdlp_path = _ensure_ytdlp(root, log)
+            ffmpeg_location = _ensure_ffmpeg(root, log)
+            _cached_tools = _ToolPaths(
+                ytdlp_path=str(ytdlp_path),
+                ffmpeg_location=str(ffmpeg_location) if ffmpeg_location else None,
+            )
+        return _cached_tools
 
 
 def _parse_progress(payload: str) -> Optional[ProgressDict]:
-    match = _PROGRESS_RE.match(payload.strip())
-    if not match:
+    parts = payload.strip().split("|", 5)
+    if len(parts) != 6:
         return None
-    status = match.group("status").strip() or "downloading"
-    downloaded = _to_int(match.group("downloaded"))
-    total = _to_int(match.group("total"))
-    estimate = _to_int(match.group("estimate"))
-    speed = _to_float(match.group("speed"))
-    eta = _to_float(match.group("eta"))
+    raw_status, raw_downloaded, raw_total, raw_estimate, raw_speed, raw_eta = parts
+    status = raw_status.strip() or "downloading"
+    downloaded = _to_int(raw_downloaded)
+    total = _to_int(raw_total)
+    estimate = _to_int(raw_estimate)
+    speed = _to_float(raw_speed)
+    eta = _to_float(raw_eta)
 
     d: ProgressDict = {"status": status}
     if downloaded is not None:
@@ -203,7 +282,29 @@ def _parse_progress(payload: str) -> Optional[ProgressDict]:
     return d
 
 
-def _terminate_process(process: subprocess.Popen[str]) -> None:
+def _iter_raw_lines(stream: IO[bytes]) -> Iterator[bytes]:
+    """Yield lines from a binary pipe, without the line terminator.
+
+    Like text mode's universal newlines, ``\r``, ``\n`` and ``\r\n`` all end a line.
+    """
+    buf = bytearray()
+    read = getattr(stream, "read1", stream.read)
+    while True:
+        chunk = read(_READ_CHUNK)
+        if not chunk:
+            break
+        buf.extend(chunk)
+        start = 0
+        for m in _LINE_END_RE.finditer(buf):
+            yield bytes(buf[start : m.start()])
+            start = m.end()
+        if start:
+            del buf[:start]
+    if buf:
+        yield bytes(buf)
+
+
+def _terminate_process(process: subprocess.Popen[bytes]) -> None:
     process.terminate()
     try:
         process.wait(timeout=5)
@@ -212,6 +313,10 @@ def _terminate_process(process: subprocess.Popen[str]) -> None:
         process.wait(timeout=5)
 
 
+def _output_template(output_dir: str) -> str:
+    return os.path.join(output_dir, "%(title).200s [%(id)s].%(ext)s")
+
+
 def _run_ytdlp(
     request: DownloadRequest,
     tools: _ToolPaths,
@@ -221,11 +326,11 @@ def _run_ytdlp(
     cancel_event: Optional[threading.Event],
     extra_args: Optional[list[str]] = None,
 ) -> None:
-    out_template = os.path.join(request.output_dir, "%(title).200s [%(id)s].%(ext)s")
+    out_template = _output_template(request.output_dir)
     merge_format = request.merge_output_format or "mp4"
 
     cmd = [
-        str(tools.ytdlp_path),
+        tools.ytdlp_path,
         "-f",
         _DEFAULT_FORMAT,
         "--merge-output-format",
@@ -254,54 +359,74 @@ def _run_ytdlp(
         cmd.extend(["--cookies", request.cookies_path])
 
     if tools.ffmpeg_location:
-        cmd.extend(["--ffmpeg-location", str(tools.ffmpeg_location)])
+        cmd.extend(["--ffmpeg-location", tools.ffmpeg_location])
 
     cmd.append(request.url)
-    recent_lines: deque[str] = deque(maxlen=20)
+    # Raw bytes; only decoded if the run fails and they become the error message.
+    recent_lines: deque[bytes] = deque(maxlen=20)
 
     process = subprocess.Popen(
         cmd,
+        stdin=subprocess.DEVNULL,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
-        bufsize=1,
+        bufsize=_READ_CHUNK,
         **_subprocess_window_kwargs(),
     )
     assert process.stdout is not None
 
-    for line in process.stdout:
+    last_emit = 0.0
+    pending: Optional[ProgressDict] = None
+
+    for raw in _iter_raw_lines(process.stdout):
         if cancel_event and cancel_event.is_set():
             _terminate_process(process)
             raise DownloadError("Cancelled by user")
 
-        cleaned = line.strip()
-        if not cleaned:
+        raw = raw.strip()
+        if not raw:
             continue
 
-        if cleaned.startswith(_PROGRESS_PREFIX):
-            payload = cleaned[len(_PROGRESS_PREFIX) :]
+        if raw.startswith(_PROGRESS_PREFIX_B):
+            payload = raw[len(_PROGRESS_PREFIX_B) :].decode("utf-8", "replace")
             d = _parse_progress(payload)
-            if d and on_progress:
+            if not d or not on_progress:
+                continue
+            if d["status"] != "downloading":
+                pending = None
                 on_progress(d)
+                continue
+            pending = d
+            now = time.monotonic()
+            if now - last_emit >= _PROGRESS_INTERVAL:
+                on_progress(pending)
+                pending = None
+                last_emit = now
             continue
 
-        if cleaned.startswith(_FILE_PREFIX):
-            final_path = cleaned[len(_FILE_PREFIX) :]
+        if raw.startswith(_FILE_PREFIX_B):
+            final_path = raw[len(_FILE_PREFIX_B) :].decode("utf-8", "replace")
+            pending = None
             if on_progress:
                 on_progress({"status": "finished", "filename": final_path})
             log(f"Saved: {final_path}")
             continue
 
-        recent_lines.append(cleaned)
-        log(cleaned)
+        recent_lines.append(raw)
+        if raw.startswith(_IMPORTANT_PREFIXES):
+            log(raw.decode("utf-8", "replace"))
+
+    if pending is not None and on_progress:
+        on_progress(pending)
 
     return_code = process.wait()
     if cancel_event and cancel_event.is_set():
         raise DownloadError("Cancelled by user")
     if return_code != 0:
-        details = "\n".join(recent_lines) if recent_lines else f"yt-dlp exited with code {return_code}."
+        if recent_lines:
+            details = b"\n".join(recent_lines).decode("utf-8", "replace")
+        else:
+            details = f"yt-dlp exited with code {return_code}."
         raise DownloadError(details)
 
 
@@ -385,6 +510,7 @@ def download(
     on_progress: Optional[Callable[[ProgressDict], None]] = None,
     log: Optional[Callable[[str], None]] = None,
     cancel_event: Optional[threading.Event] = None,
+    tools: Optional[_ToolPaths] = None,
 ) -> None:
     """Download a single URL using yt-dlp_x86.exe."""
 
@@ -392,8 +518,9 @@ def download(
         if log:
             log(msg)
 
-    os.makedirs(request.output_dir, exist_ok=True)
-    tools = _ensure_tools(_log)
+    _ensure_dir(request.output_dir)
+    if tools is None:
+        tools = _ensure_tools(_log)
 
     _log(f"Starting: {request.url}")
     _download_with_retries(
@@ -407,23 +534,9 @@ def download(
 
 
 def normalize_urls(text: str) -> list[str]:
-    urls: list[str] = []
-    for raw in (text or "").splitlines():
-        u = raw.strip()
-        if not u:
-            continue
-        # allow accidental space-separated pastes
-        urls.extend([p.strip() for p in u.split() if p.strip()])
-
-    # de-dupe while preserving order
-    seen: set[str] = set()
-    out: list[str] = []
-    for u in urls:
-        if u in seen:
-            continue
-        seen.add(u)
-        out.append(u)
-    return out
+    # Split on any whitespace (allows accidental space-separated pastes)
+    # and de-dupe while preserving order.
+    return list(dict.fromkeys((text or "").split()))
 
 
 def download_many(
@@ -435,8 +548,26 @@ def download_many(
     on_progress: Optional[Callable[[str, ProgressDict], None]] = None,
     log: Optional[Callable[[str], None]] = None,
     cancel_event: Optional[threading.Event] = None,
+    max_workers: int = 1,
 ) -> None:
-    for url in urls:
+    """Download every URL, running up to ``max_workers`` yt-dlp processes at once.
+
+    The first failure stops URLs that haven't started yet, waits for the ones
+    already running, and is then re-raised.
+    """
+
+    def _log(msg: str) -> None:
+        if log:
+            log(msg)
+
+    urls = list(urls)
+    if not urls:
+        return
+
+    tools = _ensure_tools(_log)
+    parallel = max_workers > 1
+
+    def _one(url: str) -> None:
         if cancel_event and cancel_event.is_set():
             raise DownloadError("Cancelled by user")
 
@@ -448,6 +579,22 @@ def download_many(
                 merge_output_format=merge_output_format,
             ),
             on_progress=(lambda d, _url=url: on_progress(_url, d)) if on_progress else None,
-            log=log,
+            # Output from parallel workers interleaves, so tag each line with its URL.
+            log=(lambda msg, _url=url: _log(f"[{_url}] {msg}")) if parallel else log,
             cancel_event=cancel_event,
+            tools=tools,
         )
+
+    if not parallel:
+        for url in urls:
+            _one(url)
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = [ex.submit(_one, url) for url in urls]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        except BaseException:
+            ex.shutdown(wait=True, cancel_futures=True)
+            raise
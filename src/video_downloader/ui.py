@@ -65,6 +65,12 @@ class App(ctk.CTk):
         self._q: "queue.Queue[_UiEvent]" = queue.Queue()
         self._cancel_event: Optional[threading.Event] = None
         self._worker: Optional[threading.Thread] = None
+        self._log_max = 2000
+        # Per-URL state for parallel batches, where one bar/label covers every URL.
+        self._batch_size = 0
+        self._url_fraction: dict[str, float] = {}
+        self._url_speed: dict[str, float] = {}
+        self._done_urls: set[str] = set()
 
         self._build_ui()
         self.after(100, self._poll_queue)
@@ -133,6 +139,14 @@ class App(ctk.CTk):
         )
         self.cancel_btn.grid(row=0, column=1, padx=(0, 12), pady=12)
 
+        parallel_row = ctk.CTkFrame(actions, fg_color="transparent")
+        parallel_row.grid(row=0, column=2, padx=12, pady=12, sticky="e")
+        ctk.CTkLabel(parallel_row, text="Parallel downloads").grid(row=0, column=0, padx=(0, 8))
+        # Keep the default serial: many parallel requests can get the IP rate-limited.
+        self.parallel_var = ctk.StringVar(value="1")
+        self.parallel = ctk.CTkOptionMenu(parallel_row, variable=self.parallel_var, values=["1", "2", "3", "4"], width=70)
+        self.parallel.grid(row=0, column=1)
+
         self.open_folder_btn = ctk.CTkButton(actions, text="Open Folder", command=self._open_folder)
         self.open_folder_btn.grid(row=0, column=3, padx=12, pady=12)
 
@@ -187,6 +201,7 @@ class App(ctk.CTk):
         self.download_btn.configure(state="disabled" if busy else "normal")
         self.cancel_btn.configure(state="normal" if busy else "disabled")
         self.open_folder_btn.configure(state="disabled" if busy else "normal")
+        self.parallel.configure(state="disabled" if busy else "normal")
 
     def _start_download(self) -> None:
         if self._worker and self._worker.is_alive():
@@ -208,10 +223,17 @@ class App(ctk.CTk):
             messagebox.showwarning("Cookies file not found", "cookies.txt path does not exist.")
             return
 
+        max_workers = int(self.parallel_var.get() or 1)
+
         self.progress.set(0)
         self.status_var.set("Starting...")
         self._set_busy(True)
 
+        self._batch_size = len(urls) if max_workers > 1 else 0
+        self._url_fraction = {}
+        self._url_speed = {}
+        self._done_urls = set()
+
         self._cancel_event = threading.Event()
 
         def run() -> None:
@@ -231,6 +253,7 @@ class App(ctk.CTk):
                     on_progress=on_progress,
                     log=log,
                     cancel_event=self._cancel_event,
+                    max_workers=max_workers,
                 )
                 self._q.put(_UiEvent("done", time.time() - started))
             except Exception as e:
@@ -246,36 +269,61 @@ class App(ctk.CTk):
             self._log_line("Cancel requested...")
 
     def _log_line(self, line: str) -> None:
-        self.log.insert("end", line.rstrip() + "\n")
+        self._append_log([line.rstrip()])
+
+    def _append_log(self, lines: list[str]) -> None:
+        self.log.insert("end", "\n".join(lines) + "\n")
+        # Keep only the last _log_max lines so long batches don't grow the widget forever.
+        n = int(self.log.index("end-1c").split(".")[0])
+        if n > self._log_max:
+            self.log.delete("1.0", f"{n - self._log_max}.0")
         self.log.see("end")
 
     def _poll_queue(self) -> None:
+        # Drain everything queued since the last tick, then render once:
+        # only the latest progress per URL matters and log lines go in as one insert.
+        latest_progress: dict[str, dict] = {}
+        log_lines: list[str] = []
+        done: Optional[float] = None
+        error: Optional[str] = None
         try:
             while True:
                 ev = self._q.get_nowait()
                 if ev.kind == "log":
-                    self._log_line(str(ev.payload))
+                    log_lines.append(str(ev.payload).rstrip())
                 elif ev.kind == "progress":
                     payload = ev.payload if isinstance(ev.payload, dict) else {}
                     url = str(payload.get("url", ""))
                     d = payload.get("data") if isinstance(payload.get("data"), dict) else {}
-                    self._handle_progress(url, d)
+                    latest_progress.pop(url, None)
+                    latest_progress[url] = d
                 elif ev.kind == "done":
-                    seconds = float(ev.payload or 0)
-                    self.progress.set(1)
-                    self.status_var.set(f"Done in {seconds:.1f}s.")
-                    self._set_busy(False)
+                    done = float(ev.payload or 0)
                 elif ev.kind == "error":
-                    self.status_var.set("Error.")
-                    self._set_busy(False)
-                    messagebox.showerror("Download failed", str(ev.payload))
+                    error = str(ev.payload)
                 else:
-                    self._log_line(f"[internal] unknown event: {ev.kind}")
+                    log_lines.append(f"[internal] unknown event: {ev.kind}")
         except queue.Empty:
             pass
+
+        if log_lines:
+            self._append_log(log_lines)
+        for url, d in latest_progress.items():
+            self._handle_progress(url, d)
+        if done is not None:
+            self.progress.set(1)
+            self.status_var.set(f"Done in {done:.1f}s.")
+            self._set_busy(False)
+        if error is not None:
+            self.status_var.set("Error.")
+            self._set_busy(False)
+            messagebox.showerror("Download failed", error)
         self.after(100, self._poll_queue)
 
     def _handle_progress(self, url: str, d: dict) -> None:
+        if self._batch_size > 1:
+            self._handle_batch_progress(url, d)
+            return
         status = d.get("status")
         if status == "downloading":
             downloaded = d.get("downloaded_bytes") or 0
@@ -295,6 +343,32 @@ class App(ctk.CTk):
             if url:
                 self.status_var.set(f"{status or 'Working'}: {url}")
 
+    def _handle_batch_progress(self, url: str, d: dict) -> None:
+        status = d.get("status")
+        if status == "downloading":
+            downloaded = d.get("downloaded_bytes") or 0
+            total = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
+            if total:
+                self._url_fraction[url] = min(1.0, float(downloaded) / float(total))
+            self._url_speed[url] = float(d.get("speed") or 0)
+        elif status == "finished" and d.get("filename"):
+            # Only the final "Saved" event carries a filename; it means this URL is complete.
+            self._done_urls.add(url)
+            self._url_fraction[url] = 1.0
+            self._url_speed.pop(url, None)
+
+        n = self._batch_size
+        self.progress.set(sum(self._url_fraction.values()) / n)
+        text = f"Downloading: {len(self._done_urls)}/{n} done"
+        active = {u: f for u, f in self._url_fraction.items() if u not in self._done_urls}
+        if active:
+            lead = max(active, key=active.__getitem__)
+            text += f" | {lead} {active[lead] * 100:.0f}%"
+        speed = sum(self._url_speed.values())
+        if speed:
+            text += f" | {_fmt_bytes(speed)}/s"
+        self.status_var.set(text)
+
 
 def run_app() -> None:
     app = App()